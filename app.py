@@ -1,24 +1,69 @@
 import os
+import re
+import asyncio
 import logging
-from flask import Flask, request, jsonify
+import functools
+import textwrap
+import httpx
+import orjson
+from groq import AsyncGroq
+from quart import Quart, Response, current_app, request, jsonify
+from quart.json.provider import DefaultJSONProvider
+from quart_cors import cors
 from dotenv import load_dotenv
-from langdetect import detect  # Request Lang Detection
-from groq import Groq
-from groq._base_client import SyncHttpxClientWrapper  # Soln for proxy issues
-from flask_cors import CORS
+from semantic_cache import SemanticCache
+from compression import BR_QUALITY, BR_WINDOW, choose_encoding, compress_body, compress_stream
 
 # Load environment variables
 load_dotenv()
 
-app = Flask(__name__)
-
-CORS(app, origins=["http://localhost:5174"])  # Replace w/ frontend URL
+# Dev server, reloader and debug logging only when QUART_ENV=dev
+DEV_MODE = os.getenv("QUART_ENV") == "dev"
+
+class OrjsonProvider(DefaultJSONProvider):
+    # C-backed JSON for request parsing and jsonify()
+    def dumps(self, obj, **kwargs):
+        return orjson.dumps(obj, default=self.default).decode()
+
+    def loads(self, s, **kwargs):
+        return orjson.loads(s)
+
+    def response(self, *args, **kwargs):
+        obj = self._prepare_response_obj(args, kwargs)
+        return self._app.response_class(orjson.dumps(obj, default=self.default), mimetype=self.mimetype)
+
+# Cap concurrent Groq calls to stay within the API rate limit
+GROQ_CONCURRENCY = 8
+
+class GroqResources:
+    # Per-app Groq connection state, opened and closed with that app's serving
+    # loop so one app shutting down never closes another app's client
+    def __init__(self):
+        self.http_client = None
+        self.client = None
+        self.semaphore = None
+
+    async def open(self):
+        # Async HTTP client for GROQ (also avoids the proxy issues)
+        # Reused across requests so TLS sessions are kept; HTTP/2 multiplexes concurrent calls
+        self.http_client = httpx.AsyncClient(
+            http2=True,
+            limits=httpx.Limits(max_keepalive_connections=100, max_connections=200),
+            timeout=httpx.Timeout(60.0, connect=5.0)
+        )
+        self.client = AsyncGroq(api_key=os.getenv("GROQ_API_KEY"), http_client=self.http_client)
+        self.semaphore = asyncio.Semaphore(GROQ_CONCURRENCY)
 
-# Custom HTTP client for GROQ
-http_client = SyncHttpxClientWrapper()
+    async def close(self):
+        if self.http_client:
+            await self.http_client.aclose()
+        self.http_client = self.client = self.semaphore = None
 
-# Groq client with HTTP client
-client = Groq(api_key=os.getenv("GROQ_API_KEY"), http_client=http_client)
+def get_groq():
+    groq = current_app.extensions["groq"]
+    if groq.client is None:
+        raise RuntimeError("Groq client is not open (app is not serving)")
+    return groq
 
 NDRF_PROMPT = (
     "You are an NDRF officer assisting citizens during disaster scenarios. "
@@ -77,133 +122,492 @@ NDRF_EMPLOYEE_PROMPT = (
 )
 
 
+# Detected language codes we precompute preambles for
+SUPPORTED_LANGUAGES = ("en", "hi", "ta", "te", "kn", "ml", "gu", "mr", "bn", "pa", "ks")
 
-# GROQ's parameters
-DEFAULT_MODEL = "llama-3.1-70b-versatile"
-DEFAULT_TEMPERATURE = 0.7
-DEFAULT_MAX_TOKENS = 1024
-
-#Logging starter
-logging.basicConfig(level=logging.DEBUG)
+# The system prompt stays byte-identical across requests so Groq's prefix cache
+# can reuse it; the response language goes in a short user-role preamble instead
+def language_preamble(lang):
+    return {"role": "user", "content": f"[respond in {lang}]"}
 
-@app.route('/')
-def home():
-    app.logger.info('Accessed home route')
-    return jsonify({"message": "Welcome to the NDRF Aapda Sahayta Bot!"})
+PREAMBLE_BY_LANG = {lang: language_preamble(lang) for lang in SUPPORTED_LANGUAGES}
 
-@app.route('/v1/chat', methods=['POST'])
-def generate_public_chat_response():
-    try:
-        data = request.get_json() 
-        messages = data.get('messages', [])
+PUBLIC_WELCOME_MESSAGE = (
+    "Namaste, I'm NDRF Aapda Sahayta Bot. I'm here to help you with any queries or requests you may have during a disaster. "
+    "Please feel free to ask me anything in any of the following languages: Hindi, Tamil, Telugu, Kannada, Malayalam, Gujarati, Marathi, Bengali, Punjabi, or Kashmiri. \n\n"
+    "If you need assistance, please type 'help' and I will guide you through the process."
+)
 
-        # Check if the content empty
-        if not messages or all(not msg.get("content") for msg in messages):
-            return jsonify({
-                "message": (
-                    "Namaste, I'm NDRF Aapda Sahayta Bot. I'm here to help you with any queries or requests you may have during a disaster. "
-                    "Please feel free to ask me anything in any of the following languages: Hindi, Tamil, Telugu, Kannada, Malayalam, Gujarati, Marathi, Bengali, Punjabi, or Kashmiri. \n\n"
-                    "If you need assistance, please type 'help' and I will guide you through the process."
-                ),
-                "tokens_used": 0
-            }), 200
+EMPLOYEE_WELCOME_MESSAGE = (
+    "Namaste, I'm NDRF Aapda Sahayta Bot. I'm here to assist NDRF personnel with any queries and requests during a disaster. "
+    "If you need assistance, please type 'help' and I will guide you through the process."
+)
 
-        full_messages = [{"role": "system", "content": NDRF_PROMPT}]
-
-        # Add user role to each message and detect language
-        for msg in messages:
-            msg["role"] = "user" 
-            user_language = detect(msg["content"])
-            full_messages[0]["content"] = f"{NDRF_PROMPT} Respond in {user_language}."
-            full_messages.append(msg)
-
-        # Send request to the Groq API
-        response = client.chat.completions.create(
-            messages=full_messages,
-            model=DEFAULT_MODEL,
-            temperature=DEFAULT_TEMPERATURE,
-            max_tokens=DEFAULT_MAX_TOKENS
-        )
-        assistant_message = response.choices[0].message.content
+# GROQ's parameters
+DEFAULT_MODEL = "llama-3.1-70b-versatile"
+DEFAULT_TEMPERATURE = 0.7
+DEFAULT_MAX_TOKENS = 1024
 
-        assistant_message = format_response_for_mobile(assistant_message)
+# fastText language-ID model (lid.176.ftz), loaded in a worker thread when serving starts.
+# Not committed; fetch it once with:
+#   curl -LO https://dl.fbaipublicfiles.com/fasttext/supervised-models/lid.176.ftz
+# Without it every reply falls back to the model's own language choice
+LANG_MODEL_PATH = os.getenv("LANG_MODEL_PATH", "lid.176.ftz")
+lang_detector = None
+lang_detector_error = None
+
+# Language detection only needs a prefix of the message
+DETECT_PREFIX_LENGTH = 256
+DETECT_CACHE_SIZE = 4096
+
+# Shorter ASCII-only messages are assumed English
+SHORT_QUERY_LENGTH = 20
+
+# Max characters per paragraph on mobile
+MOBILE_MAX_LENGTH = 300
+
+# Wrapper configured once; breaks only on whitespace, never inside words,
+# and leaves the text itself untouched (no tab expansion)
+mobile_wrapper = textwrap.TextWrapper(
+    width=MOBILE_MAX_LENGTH,
+    break_long_words=False,
+    break_on_hyphens=False,
+    replace_whitespace=False,
+    expand_tabs=False
+)
 
-        return jsonify({
-            "message": assistant_message,
-            "tokens_used": response.usage.total_tokens
-        }), 200
+# Splits text into the same word/whitespace chunks as mobile_wrapper
+# (textwrap's wordsep_simple_re, used when break_on_hyphens is off)
+MOBILE_WORD_SEPARATOR = re.compile(r"([\t\n\x0b\x0c\r ]+)")
+
+# Semantic response cache (multilingual embeddings cover the Indian languages)
+SEMANTIC_CACHE_MODEL = "paraphrase-multilingual-MiniLM-L12-v2"
+SEMANTIC_CACHE_THRESHOLD = 0.92
+SEMANTIC_CACHE_SIZE = 1024
+SEMANTIC_CACHE_TTL = 3600  # seconds
+
+semantic_cache = SemanticCache(
+    SEMANTIC_CACHE_MODEL,
+    threshold=SEMANTIC_CACHE_THRESHOLD,
+    maxsize=SEMANTIC_CACHE_SIZE,
+    ttl=SEMANTIC_CACHE_TTL
+)
 
-    except Exception as e:
-        return jsonify({"error": f"An error occurred: {str(e)}"}), 500
+#Logging starter (debug-level logging per request is measurable overhead in prod)
+logging.basicConfig(level=logging.DEBUG if DEV_MODE else logging.INFO)
+
+def load_detector():
+    # Blocking; run via asyncio.to_thread. A failure is kept for /v1/health
+    global lang_detector, lang_detector_error
+    if lang_detector is None:
+        try:
+            import fasttext  # Request Lang Detection
+            lang_detector = fasttext.load_model(LANG_MODEL_PATH)
+            lang_detector_error = None
+        except Exception as e:
+            lang_detector_error = f"{LANG_MODEL_PATH}: {e}"
+    return lang_detector
+
+async def open_detector():
+    if await asyncio.to_thread(load_detector) is None:
+        current_app.logger.error('Language model unavailable, replying without a language hint: %s', lang_detector_error)
+
+async def open_semantic_cache():
+    if not await asyncio.to_thread(semantic_cache.warmup):
+        current_app.logger.error('Semantic cache unavailable, chats go straight to Groq: %s', semantic_cache.error)
+
+async def start_background_loads():
+    # Model loads run beside serving instead of delaying startup; tasks are kept
+    # so after_serving can cancel whatever is still loading
+    current_app.extensions["background_loads"] = [
+        asyncio.create_task(open_detector()),
+        asyncio.create_task(open_semantic_cache())
+    ]
+
+async def stop_background_loads():
+    tasks = current_app.extensions.pop("background_loads", [])
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+def detect(text):
+    # Never load on the event loop; the model comes from open_detector()/warmup
+    if lang_detector is None:
+        raise RuntimeError(f"Language model not loaded ({lang_detector_error or 'app is not serving'})")
+
+    # fastText rejects newlines; labels look like "__label__hi"
+    labels, _ = lang_detector.predict(text.replace("\n", " "), k=1)
+    return labels[0].split("__")[-1]
+
+@functools.lru_cache(maxsize=DETECT_CACHE_SIZE)
+def _detect_prefix(prefix):
+    return detect(prefix)
+
+def cached_detect(text):
+    # Repeated/templated messages skip the n-gram model entirely
+    return _detect_prefix(text[:DETECT_PREFIX_LENGTH])
+
+def fast_lang(text):
+    # Short ASCII queries ("help", "flood") are English; skip the detector
+    text = text.strip()
+    if len(text) < SHORT_QUERY_LENGTH and text.isascii():
+        return "en"
+    # Unknown without the model (checked here so the lru_cache never stores a miss)
+    if lang_detector is None:
+        return None
+    return cached_detect(text)
+
+def split_for_mobile(response):
+    return mobile_wrapper.wrap(response)
 
 def format_response_for_mobile(response):
-    max_length = 300
-    paragraphs = []
-
-    while len(response) > max_length:
-        split_point = response.rfind(' ', 0, max_length)
-        paragraphs.append(response[:split_point])
-        response = response[split_point:].strip()
+    return "\n\n".join(split_for_mobile(response))
+
+class MobileFormatter:
+    # Incremental format_response_for_mobile(): the same chunks and line-fill
+    # rules as mobile_wrapper.wrap(), applied as text arrives. Only the chunk
+    # still arriving, and a trailing blank chunk that may be dropped at a line
+    # break, are held back
+    def __init__(self, width=MOBILE_MAX_LENGTH):
+        self.width = width
+        self._partial = ""
+        self._held = None
+        self._lines = 0
+        self._line_len = 0
+        self._line_chunks = 0
+        self._line_emitted = False
+        self._line_start = True
+        self._line_full = False
+
+    def feed(self, text):
+        chunks = [c for c in MOBILE_WORD_SEPARATOR.split(self._partial + text) if c]
+        if not chunks:
+            return ""
+        # The last chunk may continue in the next delta
+        self._partial = chunks.pop()
+        return "".join(self._place(chunk) for chunk in chunks)
+
+    def finish(self):
+        text = self._place(self._partial) if self._partial else ""
+        self._partial = ""
+        self._end_line()
+        return text
+
+    def _place(self, chunk):
+        out = []
+        while True:
+            if self._line_start:
+                self._line_start = False
+                # One blank chunk is dropped at the start of every line but the first
+                if self._lines and chunk.strip() == "":
+                    return "".join(out)
+
+            if not self._line_full and self._line_len + len(chunk) <= self.width:
+                break
+            if not self._line_full and self._line_chunks == 0:
+                # Too long for any line: it gets a line to itself
+                self._line_full = True
+                break
+
+            self._end_line()
+
+        self._line_len += len(chunk)
+        self._line_chunks += 1
+        if self._held is not None:
+            out.append(self._emit(self._held))
+            self._held = None
+        if chunk.strip() == "":
+            # Dropped if it ends up last on the line
+            self._held = chunk
+        else:
+            out.append(self._emit(chunk))
+        return "".join(out)
+
+    def _emit(self, chunk):
+        # Paragraph break before the first text of every line but the first
+        separator = "\n\n" if self._lines and not self._line_emitted else ""
+        self._line_emitted = True
+        return separator + chunk
+
+    def _end_line(self):
+        self._held = None
+        if self._line_emitted:
+            self._lines += 1
+        self._line_len = self._line_chunks = 0
+        self._line_emitted = self._line_full = False
+        self._line_start = True
+
+def sse_event(event, payload):
+    return b"event: " + event + b"\ndata: " + orjson.dumps(payload) + b"\n\n"
+
+async def generate_chat_stream(groq, full_messages, on_complete=None):
+    formatter = MobileFormatter()
+    deltas = []
+    streamed = []
+    tokens_used = 0
 
-    if response:
-        paragraphs.append(response)
-
-    return "\n\n".join(paragraphs)
-
-@app.route('/v1/employee-chat', methods=['POST'])
-def generate_employee_chat_response():
     try:
-        data = request.get_json() 
-        messages = data.get('messages', [])
+        # Send streaming request to the Groq API
+        async with groq.semaphore:
+            stream = await groq.client.chat.completions.create(
+                messages=full_messages,
+                model=DEFAULT_MODEL,
+                temperature=DEFAULT_TEMPERATURE,
+                max_tokens=DEFAULT_MAX_TOKENS,
+                stream=True
+            )
+
+            # Close the upstream stream however this ends (client disconnect,
+            # error, timeout) so the pooled connection is released
+            try:
+                async for chunk in stream:
+                    if chunk.choices and chunk.choices[0].delta.content:
+                        deltas.append(chunk.choices[0].delta.content)
+
+                        # Forward each delta as it arrives, with mobile line breaks inserted
+                        text = formatter.feed(deltas[-1])
+                        if text:
+                            streamed.append(text)
+                            yield sse_event(b"token", text)
+
+                    # Groq reports usage on the final chunk
+                    if chunk.x_groq and chunk.x_groq.usage:
+                        tokens_used = chunk.x_groq.usage.total_tokens
+                        logging.debug('Groq prompt tokens: %s', chunk.x_groq.usage.prompt_tokens)
+            finally:
+                await stream.close()
+
+        text = formatter.finish()
+        if text:
+            streamed.append(text)
+            yield sse_event(b"token", text)
+
+        # Usage is only known at end-of-stream, so it comes last as its own event
+        yield sse_event(b"usage", {"total_tokens": tokens_used})
+
+        # Incremental wrapping must match wrapping the whole response at once
+        assistant_message = format_response_for_mobile("".join(deltas))
+        if "".join(streamed) != assistant_message:
+            logging.warning('Streamed text differs from format_response_for_mobile() output')
+
+        if on_complete:
+            on_complete(assistant_message, tokens_used)
 
-        # Check if the content empty
-        if not messages or all(not msg.get("content") for msg in messages):
-            return jsonify({
-                "message": (
-                    "Namaste, I'm NDRF Aapda Sahayta Bot. I'm here to assist NDRF personnel with any queries and requests during a disaster. "
-                    "If you need assistance, please type 'help' and I will guide you through the process."
-                ),
-                "tokens_used": 0
-            }), 200
+    except Exception as e:
+        # Headers are already sent, so report the failure in-stream
+        yield sse_event(b"error", {"error": f"An error occurred: {str(e)}"})
+
+async def generate_cached_stream(assistant_message, tokens_used):
+    yield sse_event(b"token", assistant_message)
+    yield sse_event(b"usage", {"total_tokens": tokens_used, "cached": True})
+
+def event_stream_response(events):
+    headers = {
+        "Cache-Control": "no-cache",
+        "X-Accel-Buffering": "no"  # Disable proxy buffering (nginx)
+    }
+
+    # Compress per event (flushed), so streaming is not held back
+    config = current_app.config
+    encoding = choose_encoding(request.accept_encodings, config["COMPRESS_ALGORITHM"])
+    if encoding:
+        events = compress_stream(events, encoding, config["COMPRESS_BR_LEVEL"], config["COMPRESS_BR_WINDOW"])
+        headers["Content-Encoding"] = encoding
+        headers["Vary"] = "Accept-Encoding"
+
+    return Response(events, mimetype="text/event-stream", headers=headers)
+
+def stream_chat_response(full_messages, on_complete=None):
+    return event_stream_response(generate_chat_stream(get_groq(), full_messages, on_complete))
+
+def stream_cached_response(assistant_message, tokens_used):
+    return event_stream_response(generate_cached_stream(assistant_message, tokens_used))
+
+def make_chat_route(system_prompt, welcome_message, cache_name):
+    # Shared handler for every chat endpoint, parameterized by its prompt
+    system_message = {"role": "system", "content": system_prompt}
+    welcome_bytes = orjson.dumps({"message": welcome_message, "tokens_used": 0})
+
+    async def chat_response():
+        try:
+            data = orjson.loads(await request.get_data())
+            messages = data.get('messages', [])
+
+            # Fresh user-role dicts in one pass; empty messages are dropped
+            user_messages = [
+                {"role": "user", "content": msg["content"]} for msg in messages if msg.get("content")
+            ]
+
+            # Check if the content empty
+            if not user_messages:
+                return Response(welcome_bytes, status=200, mimetype='application/json')
+
+            # Only the latest message decides the response language
+            latest_content = user_messages[-1]["content"]
+            user_language = fast_lang(latest_content)
+            full_messages = [system_message] + user_messages
+
+            # No preamble when the language is unknown (model missing)
+            if user_language:
+                preamble = PREAMBLE_BY_LANG.get(user_language) or language_preamble(user_language)
+                full_messages.insert(1, preamble)
+
+            # Only single-message conversations are cached: the key is the latest
+            # message alone, so earlier turns must not change what is answered.
+            # Until the cache model has loaded (or if it failed to), skip it
+            if len(user_messages) > 1 or not semantic_cache.ready:
+                return stream_chat_response(full_messages)
+
+            # Serve semantically equivalent queries from the cache; any cache
+            # failure falls through to Groq
+            cache_namespace = (cache_name, user_language)
+            logger = current_app.logger
+            try:
+                query_embedding = await asyncio.to_thread(semantic_cache.embed, latest_content)
+                cached = semantic_cache.get(cache_namespace, query_embedding)
+            except Exception:
+                logger.exception('Semantic cache lookup failed')
+                return stream_chat_response(full_messages)
+
+            if cached:
+                return stream_cached_response(*cached)
+
+            def on_complete(assistant_message, tokens_used):
+                try:
+                    semantic_cache.put(cache_namespace, query_embedding, assistant_message, tokens_used)
+                except Exception:
+                    logger.exception('Semantic cache insert failed')
+
+            # Stream the Groq completion back as it is generated
+            return stream_chat_response(full_messages, on_complete)
+
+        except Exception as e:
+            return jsonify({"error": f"An error occurred: {str(e)}"}), 500
+
+    return chat_response
+
+async def home():
+    current_app.logger.info('Accessed home route')
+    return jsonify({"message": "Welcome to the NDRF Aapda Sahayta Bot!"})
 
-        full_messages = [{"role": "system", "content": NDRF_EMPLOYEE_PROMPT}]
-
-        # Add user role to each message and detect language
-        for msg in messages:
-            msg["role"] = "user" 
-            user_language = detect(msg["content"])
-            full_messages[0]["content"] = f"{NDRF_EMPLOYEE_PROMPT} Respond in {user_language}."
-            full_messages.append(msg)
-
-        # Send request to the Groq API
-        response = client.chat.completions.create(
-            messages=full_messages,
-            model=DEFAULT_MODEL,
-            temperature=DEFAULT_TEMPERATURE,
-            max_tokens=DEFAULT_MAX_TOKENS
-        )
-        assistant_message = response.choices[0].message.content
+# Static health payload, serialized once
+HEALTH_BYTES = orjson.dumps({
+    "status": "healthy",
+    "message": "Aapda Sahayta Bot, COPY!"
+})
 
-        assistant_message = format_response_for_mobile(assistant_message)
+async def health_check():
+    current_app.logger.info('Health check accessed')
 
+    # Chats still work without the language model (still loading, or failed),
+    # just without a language hint
+    if lang_detector is None:
         return jsonify({
-            "message": assistant_message,
-            "tokens_used": response.usage.total_tokens
+            "status": "degraded",
+            "message": "Aapda Sahayta Bot, COPY!",
+            "language_model": {"loaded": False, "loading": lang_detector_error is None, "error": lang_detector_error}
         }), 200
 
-    except Exception as e:
-        return jsonify({"error": f"An error occurred: {str(e)}"}), 500
-
-
-@app.route('/v1/health', methods=['GET'])
-def health_check():
-    app.logger.info('Health check accessed')
-    return jsonify({
-        "status": "healthy",
-        "message": "Aapda Sahayta Bot, COPY!"
-    }), 200
+    # Optional upstream check: ?upstream=1 sends a HEAD to Groq over the shared pool
+    if request.args.get("upstream"):
+        try:
+            groq = get_groq()
+            upstream = await groq.http_client.head(str(groq.client.base_url), timeout=5.0)
+            return jsonify({
+                "status": "healthy",
+                "message": "Aapda Sahayta Bot, COPY!",
+                "groq": {"reachable": True, "http_version": upstream.http_version}
+            }), 200
+        except httpx.HTTPError as e:
+            return jsonify({
+                "status": "degraded",
+                "message": "Aapda Sahayta Bot, COPY!",
+                "groq": {"reachable": False, "error": str(e)}
+            }), 503
+
+    return Response(HEALTH_BYTES, status=200, mimetype='application/json')
+
+async def warmup():
+    # Call post-deploy so the first chat request doesn't pay for model loads
+    current_app.logger.info('Warmup accessed')
+    # Chats work without the language model, so a missing one only degrades
+    if await asyncio.to_thread(load_detector) is None:
+        return jsonify({"status": "degraded", "language_model": {"loaded": False, "error": lang_detector_error}}), 200
+
+    # The semantic cache is optional; chats fall through to Groq without it
+    if not await asyncio.to_thread(semantic_cache.warmup):
+        return jsonify({"status": "warm", "semantic_cache": {"loaded": False, "error": semantic_cache.error}}), 200
+
+    return jsonify({"status": "warm"}), 200
+
+async def compress_response(response):
+    # Buffered JSON bodies only; event streams are compressed as they are generated
+    if (
+        response.mimetype != "application/json"
+        or "Content-Encoding" in response.headers
+        or response.status_code < 200
+    ):
+        return response
+
+    config = current_app.config
+    encoding = choose_encoding(request.accept_encodings, config["COMPRESS_ALGORITHM"])
+    if not encoding:
+        return response
+
+    data = await response.get_data()
+    if len(data) < config["COMPRESS_MIN_SIZE"]:
+        return response
+
+    response.set_data(compress_body(data, encoding, config["COMPRESS_BR_LEVEL"], config["COMPRESS_BR_WINDOW"]))
+    response.headers["Content-Encoding"] = encoding
+    response.vary.add("Accept-Encoding")
+    return response
+
+DEFAULT_CONFIG = {
+    "CORS_ORIGINS": ["http://localhost:5174"],  # Replace w/ frontend URL
+    "COMPRESS_ALGORITHM": ["br", "gzip"],  # Brotli preferred, gzip fallback
+    "COMPRESS_BR_LEVEL": BR_QUALITY,  # 0-11; higher costs far more CPU per response
+    "COMPRESS_BR_WINDOW": BR_WINDOW,  # lgwin, 10-24
+    "COMPRESS_MIN_SIZE": 500  # bytes
+}
+
+def create_app(config=None):
+    app = Quart(__name__)
+    app.json = OrjsonProvider(app)
+    app.config.update(DEFAULT_CONFIG)
+    app.config.update(config or {})
+
+    app = cors(app, allow_origin=app.config["CORS_ORIGINS"])
+
+    app.add_url_rule('/', 'home', home)
+    app.add_url_rule(
+        '/v1/chat', 'generate_public_chat_response',
+        make_chat_route(NDRF_PROMPT, PUBLIC_WELCOME_MESSAGE, "public"),
+        methods=['POST']
+    )
+    app.add_url_rule(
+        '/v1/employee-chat', 'generate_employee_chat_response',
+        make_chat_route(NDRF_EMPLOYEE_PROMPT, EMPLOYEE_WELCOME_MESSAGE, "employee"),
+        methods=['POST']
+    )
+    app.add_url_rule('/v1/health', 'health_check', health_check, methods=['GET'])
+    app.add_url_rule('/v1/warmup', 'warmup', warmup, methods=['GET', 'POST'])
+    app.after_request(compress_response)
+
+    groq = app.extensions["groq"] = GroqResources()
+    app.before_serving(start_background_loads)
+    app.before_serving(groq.open)
+    app.after_serving(stop_background_loads)
+    app.after_serving(groq.close)
+
+    return app
+
+app = create_app()
 
 if __name__ == '__main__':
-    # Run the Flask 
-    app.logger.info('Starting Flask app')
-    app.run(debug=True, host='0.0.0.0', port=5000)
+    if DEV_MODE:
+        # Run the Quart dev server
+        app.logger.info('Starting Quart app')
+        app.run(debug=True, host='0.0.0.0', port=5000)
+    else:
+        app.logger.error('Production: run with `gunicorn -c gunicorn.conf.py app:app` (or set QUART_ENV=dev)')
@@ -0,0 +1,34 @@
+import gzip
+import zlib
+import brotli
+
+
+def choose_encoding(accept_encodings, algorithms):
+    # Highest client q-value wins; ties go to the server's preference order
+    return accept_encodings.best_match(algorithms)
+
+
+# Brotli's default quality (11) is far too slow to run per response on the
+# event loop; 4-5 is close to gzip's speed and still smaller
+BR_QUALITY = 5
+BR_WINDOW = 18  # log2 of the sliding window; responses are small
+
+
+def compress_body(data, encoding, quality=BR_QUALITY, lgwin=BR_WINDOW):
+    if encoding == "br":
+        return brotli.compress(data, mode=brotli.MODE_TEXT, quality=quality, lgwin=lgwin)
+    return gzip.compress(data)
+
+
+async def compress_stream(chunks, encoding, quality=BR_QUALITY, lgwin=BR_WINDOW):
+    # Flush after every chunk so each SSE event reaches the client immediately
+    if encoding == "br":
+        compressor = brotli.Compressor(mode=brotli.MODE_TEXT, quality=quality, lgwin=lgwin)
+        async for chunk in chunks:
+            yield compressor.process(chunk) + compressor.flush()
+        yield compressor.finish()
+    else:
+        compressor = zlib.compressobj(wbits=31)
+        async for chunk in chunks:
+            yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+        yield compressor.flush()
@@ -0,0 +1,22 @@
+import os
+
+# Production server: gunicorn -c gunicorn.conf.py app:app
+bind = os.getenv("BIND", "0.0.0.0:5000")
+
+# ASGI workers so the async Groq calls overlap within each process
+# (uvicorn.workers is deprecated in favour of the uvicorn-worker package)
+worker_class = "uvicorn_worker.UvicornWorker"
+
+# One event loop already serves many streams, so few workers are needed.
+# Each one loads its own torch + MiniLM model (several hundred MB) and keeps
+# its own semantic cache, so raise WEB_CONCURRENCY only with memory to spare
+workers = int(os.getenv("WEB_CONCURRENCY", 2))
+
+keepalive = 30
+# Worker heartbeat: async workers are restarted only after this long without
+# checking in (a blocked event loop), it does not limit request duration
+timeout = 120
+graceful_timeout = 30
+
+loglevel = os.getenv("LOG_LEVEL", "info")
+accesslog = "-"
@@ -0,0 +1,90 @@
+import threading
+import numpy as np
+from cachetools import TTLCache
+
+
+# Nearest-neighbour cache of chat responses keyed by query embedding.
+# One FAISS index per namespace (prompt + language) so endpoints never share
+# answers; TTLCache handles freshness and expired ids are dropped lazily.
+class SemanticCache:
+    def __init__(self, model_name, threshold=0.92, maxsize=1024, ttl=3600, search_k=4):
+        self.model_name = model_name
+        self.threshold = threshold
+        self.search_k = search_k
+        self.error = None
+        self._model = None
+        self._faiss = None
+        self._indexes = {}
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._next_id = 0
+        self._lock = threading.Lock()
+        self._load_lock = threading.Lock()
+
+    @property
+    def ready(self):
+        return self._model is not None and self._faiss is not None
+
+    def warmup(self):
+        # Blocking (imports torch and faiss, loads the model), call from a worker
+        # thread. Tried once: a failure is kept in .error and never retried, so
+        # callers just check .ready and skip the cache
+        with self._load_lock:
+            if not self.ready and self.error is None:
+                try:
+                    import faiss
+                    from sentence_transformers import SentenceTransformer
+                    self._model = SentenceTransformer(self.model_name)
+                    self._faiss = faiss
+                except Exception as e:
+                    self.error = f"{self.model_name}: {e}"
+        return self.ready
+
+    def embed(self, text):
+        # Blocking (CPU-bound), call from a worker thread once .ready
+        embedding = self._model.encode([text], normalize_embeddings=True)
+        return np.asarray(embedding, dtype="float32")
+
+    def get(self, namespace, embedding):
+        with self._lock:
+            index = self._indexes.get(namespace)
+            if index is None or index.ntotal == 0:
+                return None
+
+            scores, ids = index.search(embedding, self.search_k)
+            expired = []
+            hit = None
+            for score, entry_id in zip(scores[0], ids[0]):
+                if entry_id < 0 or score < self.threshold:
+                    break
+                entry = self._entries.get(int(entry_id))
+                if entry is None:
+                    expired.append(entry_id)
+                    continue
+                hit = entry
+                break
+
+            if expired:
+                index.remove_ids(np.asarray(expired, dtype="int64"))
+            return hit
+
+    def put(self, namespace, embedding, response, tokens_used):
+        with self._lock:
+            index = self._indexes.get(namespace)
+            if index is None:
+                index = self._faiss.IndexIDMap(self._faiss.IndexFlatIP(embedding.shape[1]))
+                self._indexes[namespace] = index
+
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = (response, tokens_used)
+            index.add_with_ids(embedding, np.asarray([entry_id], dtype="int64"))
+
+            # Evicted ids linger in the index until searched; prune when it doubles
+            if index.ntotal > 2 * self._entries.maxsize:
+                self._prune(index)
+
+    def _prune(self, index):
+        live = set(self._entries.keys())
+        stale = [entry_id for entry_id in self._faiss.vector_to_array(index.id_map) if entry_id not in live]
+        if stale:
+            index.remove_ids(np.asarray(stale, dtype="int64"))
@@ -0,0 +1,57 @@
+import copy
+import random
+
+import pytest
+
+from app import MOBILE_MAX_LENGTH, MobileFormatter, format_response_for_mobile, mobile_wrapper
+
+# Words, Unicode whitespace textwrap strips but never splits on (\xa0, \u3000),
+# and words longer than either width
+PIECES = [
+    "Move", "to", "higher", "ground.", "Call", "112", "1.", "well-known", "बाढ़", "आ", "गई",
+    " ", "  ", "\t", "\r\n", "\n", "\n\n", "\xa0", "\u3000", "word\xa0word", "x" * 25, "y" * 400,
+]
+SEPARATORS = ["", " ", " ", "\n", "\t", "\r\n"]
+
+
+def random_text(rnd):
+    return "".join(rnd.choice(PIECES) + rnd.choice(SEPARATORS) for _ in range(rnd.randint(0, 300)))
+
+
+def random_deltas(rnd, text):
+    # Cut anywhere, including mid-word and mid-whitespace, as Groq deltas are
+    cuts = sorted(rnd.sample(range(1, len(text)), min(len(text) - 1, rnd.randint(0, 60)))) if len(text) > 1 else []
+    return [text[start:end] for start, end in zip([0] + cuts, cuts + [len(text)])]
+
+
+def expected(text, width):
+    if width == MOBILE_MAX_LENGTH:
+        return format_response_for_mobile(text)
+    wrapper = copy.copy(mobile_wrapper)
+    wrapper.width = width
+    return "\n\n".join(wrapper.wrap(text))
+
+
+def stream(deltas, width):
+    formatter = MobileFormatter(width=width)
+    return "".join(formatter.feed(delta) for delta in deltas) + formatter.finish()
+
+
+@pytest.mark.parametrize("width", [20, MOBILE_MAX_LENGTH])
+def test_random_deltas_match_whole_text_wrap(width):
+    for seed in range(500):
+        rnd = random.Random(seed)
+        text = random_text(rnd)
+        assert stream(random_deltas(rnd, text), width) == expected(text, width), f"seed {seed}"
+
+
+@pytest.mark.parametrize("width", [20, MOBILE_MAX_LENGTH])
+def test_single_character_deltas_match_whole_text_wrap(width):
+    for seed in range(50):
+        text = random_text(random.Random(seed))
+        assert stream(list(text), width) == expected(text, width), f"seed {seed}"
+
+
+def test_blank_input_yields_nothing():
+    assert stream([], MOBILE_MAX_LENGTH) == ""
+    assert stream(["", "  ", "\n\n", "\t"], MOBILE_MAX_LENGTH) == expected("  \n\n\t", MOBILE_MAX_LENGTH) == ""